@@ -0,0 +1,106 @@
+"""Tests that failures in sources checked through `--srcs-file` are reported."""
+
+import os
+import platform
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from python.runfiles import Runfiles
+
+
+def _rlocation(runfiles: Runfiles, rlocationpath: str) -> Path:
+    """Look up a runfile and ensure the file exists
+
+    Args:
+        runfiles: The runfiles object
+        rlocationpath: The runfile key
+
+    Returns:
+        The requested runifle.
+    """
+    # TODO: https://github.com/periareon/rules_venv/issues/37
+    source_repo = None
+    if platform.system() == "Windows":
+        source_repo = ""
+    runfile = runfiles.Rlocation(rlocationpath, source_repo)
+    if not runfile:
+        raise FileNotFoundError(f"Failed to find runfile: {rlocationpath}")
+    path = Path(runfile)
+    if not path.exists():
+        raise FileNotFoundError(f"Runfile does not exist: ({rlocationpath}) {path}")
+    return path
+
+
+class AggregateFailureTest(unittest.TestCase):
+    """Run the tclint runners the way `tcl_tclint_aggregate` does on failing sources."""
+
+    def setUp(self) -> None:
+        runfiles = Runfiles.Create()
+        if not runfiles:
+            raise EnvironmentError("Failed to locate runfiles.")
+        self.runfiles = runfiles
+
+        self.tmp_dir = Path(tempfile.mkdtemp(dir=os.environ.get("TEST_TMPDIR", None)))
+
+    def check(self, runner: str, args_env: str) -> subprocess.CompletedProcess[str]:
+        """Run a runner on both failing sources listed in a `--srcs-file`.
+
+        Args:
+            runner: The env var holding the rlocationpath of the runner.
+            args_env: The env var the runner reads its args file from.
+
+        Returns:
+            The completed runner process.
+        """
+        srcs_file = self.tmp_dir / f"{runner}.srcs.txt"
+        srcs_file.write_text(
+            "\n".join([os.environ["UNBRACED_EXPR"], os.environ["UNFORMATTED"]]),
+            encoding="utf-8",
+        )
+
+        args_file = self.tmp_dir / f"{runner}.args.txt"
+        args_file.write_text(
+            "\n".join(
+                [
+                    "--config",
+                    os.environ["TCLINT_CONFIG"],
+                    "--srcs-file",
+                    str(srcs_file),
+                ]
+            ),
+            encoding="utf-8",
+        )
+
+        env = dict(os.environ)
+        env[args_env] = str(args_file)
+        return subprocess.run(
+            [str(_rlocation(self.runfiles, os.environ[runner]))],
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            encoding="utf-8",
+            check=False,
+        )
+
+    def test_lint_failure(self) -> None:
+        """Lint violations in sources from a `--srcs-file` fail the check."""
+        result = self.check("LINTER", "RULES_TCL_LINT_ARGS_FILE")
+
+        self.assertNotEqual(result.returncode, 0, result.stdout)
+        self.assertIn("unbraced_expr.tcl", result.stdout)
+        self.assertIn("[unbraced-expr]", result.stdout)
+
+    def test_format_failure(self) -> None:
+        """Unformatted sources from a `--srcs-file` fail the check with a diff."""
+        result = self.check("FORMAT_CHECKER", "RULES_TCL_FORMAT_ARGS_FILE")
+
+        self.assertNotEqual(result.returncode, 0, result.stdout)
+        self.assertIn("unformatted.tcl: needs reformatting", result.stdout)
+        self.assertIn("+    return [expr {$a + $b}]", result.stdout)
+        self.assertNotIn("unbraced_expr.tcl: needs reformatting", result.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
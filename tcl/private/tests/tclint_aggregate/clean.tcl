@@ -0,0 +1,5 @@
+# A source which passes linting and format checking.
+
+proc add {a b} {
+    return [expr {$a + $b}]
+}
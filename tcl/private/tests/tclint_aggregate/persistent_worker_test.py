@@ -0,0 +1,158 @@
+"""Tests for the tclint runners serving Bazel persistent worker requests."""
+
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Any
+
+from python.runfiles import Runfiles
+
+
+def _rlocation(runfiles: Runfiles, rlocationpath: str) -> Path:
+    """Look up a runfile and ensure the file exists
+
+    Args:
+        runfiles: The runfiles object
+        rlocationpath: The runfile key
+
+    Returns:
+        The requested runifle.
+    """
+    # TODO: https://github.com/periareon/rules_venv/issues/37
+    source_repo = None
+    if platform.system() == "Windows":
+        source_repo = ""
+    runfile = runfiles.Rlocation(rlocationpath, source_repo)
+    if not runfile:
+        raise FileNotFoundError(f"Failed to find runfile: {rlocationpath}")
+    path = Path(runfile)
+    if not path.exists():
+        raise FileNotFoundError(f"Runfile does not exist: ({rlocationpath}) {path}")
+    return path
+
+
+class PersistentWorkerTest(unittest.TestCase):
+    """Send passing, failing, and malformed requests to the runners' worker mode."""
+
+    def setUp(self) -> None:
+        runfiles = Runfiles.Create()
+        if not runfiles:
+            raise EnvironmentError("Failed to locate runfiles.")
+        self.runfiles = runfiles
+
+        self.tmp_dir = Path(tempfile.mkdtemp(dir=os.environ.get("TEST_TMPDIR", None)))
+
+    def request(
+        self, request_id: int, src: str, extra_args: tuple[str, ...] = ()
+    ) -> dict[str, Any]:
+        """Build a work request checking a single source.
+
+        Args:
+            request_id: The id of the request.
+            src: The env var holding the rlocationpath of the source.
+            extra_args: Additional arguments for the runner.
+
+        Returns:
+            The work request.
+        """
+        return {
+            "arguments": [
+                "--config",
+                str(_rlocation(self.runfiles, os.environ["TCLINT_CONFIG"])),
+                "--src",
+                str(_rlocation(self.runfiles, os.environ[src])),
+                "--marker",
+                str(self.tmp_dir / f"{request_id}.ok"),
+                *extra_args,
+            ],
+            "requestId": request_id,
+        }
+
+    def serve(
+        self, runner: str, requests: list[dict[str, Any]]
+    ) -> dict[int, dict[str, Any]]:
+        """Send work requests to a runner started as a persistent worker.
+
+        Args:
+            runner: The env var holding the rlocationpath of the runner.
+            requests: The work requests to send.
+
+        Returns:
+            The work responses, keyed by request id.
+        """
+        result = subprocess.run(
+            [str(_rlocation(self.runfiles, os.environ[runner])), "--persistent_worker"],
+            input="".join(json.dumps(request) + "\n" for request in requests),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            encoding="utf-8",
+            check=False,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        # Stdout must carry nothing but one response per request, including after
+        # runs which point the stdout file descriptor at the null device.
+        responses = [json.loads(line) for line in result.stdout.splitlines()]
+        self.assertEqual(
+            [response["requestId"] for response in responses],
+            [request["requestId"] for request in requests],
+            result.stdout,
+        )
+        for response in responses:
+            self.assertEqual(
+                sorted(response), ["exitCode", "output", "requestId"], response
+            )
+
+        return {response["requestId"]: response for response in responses}
+
+    def test_lint(self) -> None:
+        """The linter reports each request's result under its own id."""
+        responses = self.serve(
+            "LINTER",
+            [
+                self.request(1, "UNBRACED_EXPR"),
+                self.request(2, "CLEAN"),
+                self.request(3, "CLEAN", ("--unknown",)),
+            ],
+        )
+
+        self.assertNotEqual(responses[1]["exitCode"], 0, responses[1])
+        self.assertIn("unbraced_expr.tcl", responses[1]["output"])
+        self.assertIn("[unbraced-expr]", responses[1]["output"])
+
+        self.assertEqual(responses[2]["exitCode"], 0, responses[2])
+        self.assertEqual(responses[2]["output"], "")
+        self.assertTrue((self.tmp_dir / "2.ok").exists())
+
+        self.assertEqual(responses[3]["exitCode"], 2, responses[3])
+        self.assertIn("unrecognized arguments: --unknown", responses[3]["output"])
+
+    def test_format(self) -> None:
+        """The format checker reports each request's result under its own id."""
+        responses = self.serve(
+            "FORMAT_CHECKER",
+            [
+                self.request(1, "UNFORMATTED"),
+                self.request(2, "CLEAN"),
+                self.request(3, "CLEAN", ("--unknown",)),
+            ],
+        )
+
+        self.assertNotEqual(responses[1]["exitCode"], 0, responses[1])
+        self.assertIn("unformatted.tcl: needs reformatting", responses[1]["output"])
+        self.assertIn("+    return [expr {$a + $b}]", responses[1]["output"])
+
+        self.assertEqual(responses[2]["exitCode"], 0, responses[2])
+        self.assertEqual(responses[2]["output"], "")
+        self.assertTrue((self.tmp_dir / "2.ok").exists())
+
+        self.assertEqual(responses[3]["exitCode"], 2, responses[3])
+        self.assertIn("unrecognized arguments: --unknown", responses[3]["output"])
+
+
+if __name__ == "__main__":
+    unittest.main()
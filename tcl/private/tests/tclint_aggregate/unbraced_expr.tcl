@@ -0,0 +1,5 @@
+# A source which fails linting.
+
+proc add {a b} {
+    return [expr $a + $b]
+}
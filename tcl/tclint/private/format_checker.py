@@ -8,12 +8,56 @@ import platform
 import shutil
 import sys
 import tempfile
-from contextlib import redirect_stderr, redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, redirect_stderr, redirect_stdout
 from pathlib import Path
+from typing import Iterator, Optional, TextIO
 
 from python.runfiles import Runfiles
 from tclint.cli.tclfmt import main as tclfmt_main
 
+try:
+    from tclint.cli.tclfmt import (
+        EXIT_FORMAT_VIOLATIONS,
+        EXIT_INPUT_ERROR,
+        EXIT_SYNTAX_ERROR,
+    )
+    from tclint.cli.utils import register_codec_warning, resolve_sources
+    from tclint.config import Config, ConfigError, RunConfig, get_config
+    from tclint.format import Formatter, FormatterOpts
+    from tclint.parser import Parser, TclSyntaxError
+
+    HAS_FORMAT_API = True
+except ImportError:
+    # Older versions of tclint are driven through the `tclfmt` CLI instead.
+    HAS_FORMAT_API = False
+
+try:
+    # Patience diff is faster than `difflib` on long files with few changes.
+    from patiencediff import unified_diff as patience_unified_diff
+except ImportError:
+    patience_unified_diff = difflib.unified_diff  # type: ignore[assignment]
+
+from tcl.tclint.private.runner import (
+    cache_entry,
+    discard_output,
+    inputs_digest,
+    marker_is_current,
+    parallel_jobs,
+    record_cache_entry,
+    run_persistent_worker,
+    write_marker,
+)
+
+# The number of diffs below which diff generation always runs in a single process.
+PARALLEL_DIFF_THRESHOLD = 5
+
+# The original path and the original and formatted lines of a source.
+FormatResult = tuple[Path, list[str], list[str]]
+
+# The `ioctl` request for cloning a file on Linux (see `ioctl_ficlone(2)`).
+FICLONE = 0x40049409
+
 
 def _rlocation(runfiles: Runfiles, rlocationpath: str) -> Path:
     """Look up a runfile and ensure the file exists
@@ -38,11 +82,16 @@ def _rlocation(runfiles: Runfiles, rlocationpath: str) -> Path:
     return path
 
 
-def parse_args() -> argparse.Namespace:
-    """Parse command line arguments."""
-    parser = argparse.ArgumentParser(description=__doc__)
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments.
+
+    Args:
+        argv: Arguments to parse instead of `sys.argv`.
 
-    argv = None
+    Returns:
+        The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, fromfile_prefix_chars="@")
 
     def _lookup(value: str) -> Path:
         del value
@@ -67,11 +116,15 @@ def parse_args() -> argparse.Namespace:
         "--src",
         dest="srcs",
         type=_lookup if use_args_file else Path,
-        required=True,
         action="append",
         default=[],
         help="Sources to lint/format.",
     )
+    parser.add_argument(
+        "--srcs-file",
+        type=_lookup if use_args_file else Path,
+        help="A file containing newline separated sources to lint/format.",
+    )
     parser.add_argument(
         "--config",
         type=_lookup if use_args_file else Path,
@@ -81,23 +134,38 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--marker",
         type=Path,
-        help="An optional output to touch upon successful lint/formatting.",
+        help="An optional output to write upon successful lint/formatting.",
     )
 
-    return parser.parse_args(argv)
+    args = parser.parse_args(argv)
+
+    if args.srcs_file:
+        lookup = _lookup if use_args_file else Path
+        args.srcs.extend(
+            lookup(line)
+            for line in args.srcs_file.read_text(encoding="utf-8").splitlines()
+            if line
+        )
+
+    if not args.srcs:
+        parser.error("at least one source is required from --src or --srcs-file")
+
+    return args
 
 
 def run_format(
-    config: Path, srcs: list[Path], extra_args: list[str]
+    config: Path,
+    srcs: list[Path],
+    extra_args: list[str],
+    capture: bool = True,
 ) -> tuple[int, str]:
-    """Run tclfmt with --check to see if files need formatting.
+    """Run tclfmt and capture its output.
 
     Args:
         config: Path to the config file
         srcs: List of source file paths
-        original_argv: Original sys.argv to restore
-        original_stdout: Original sys.stdout to restore
-        original_stderr: Original sys.stderr to restore
+        extra_args: Additional arguments to pass to tclfmt
+        capture: Whether to capture output. Otherwise output is discarded.
 
     Returns:
         Tuple of (return_code, captured_output)
@@ -115,8 +183,14 @@ def run_format(
         # Set up sys.argv for tclfmt_main
         sys.argv = tool_args
 
-        # Capture both stdout and stderr to the shared buffer
-        with redirect_stdout(output_buffer), redirect_stderr(output_buffer):
+        # Capture both stdout and stderr to the shared buffer (or discard them)
+        with ExitStack() as stack:
+            if capture:
+                stack.enter_context(redirect_stdout(output_buffer))
+                stack.enter_context(redirect_stderr(output_buffer))
+            else:
+                stack.enter_context(discard_output())
+
             # Run tclfmt main function
             return_code = 0
             try:
@@ -140,6 +214,77 @@ def run_format(
         sys.argv = original_argv
 
 
+def common_parts(paths: list[Path]) -> tuple[str, ...]:
+    """Find the path components shared by the start of every path.
+
+    Args:
+        paths: A non-empty list of paths.
+
+    Returns:
+        The common leading components, which may be empty.
+    """
+    prefix = paths[0].parts
+    for path in paths[1:]:
+        parts = path.parts
+        limit = min(len(prefix), len(parts))
+        count = 0
+        while count < limit and prefix[count] == parts[count]:
+            count += 1
+        prefix = prefix[:count]
+        if not prefix:
+            break
+
+    return prefix
+
+
+def copy_file(src: Path, dst: Path) -> None:
+    """Copy a file's contents and timestamps, copying within the kernel if possible.
+
+    On Linux, the copy is first attempted as a reflink (`FICLONE`) which shares
+    the source's data on copy-on-write filesystems such as btrfs and xfs, then with
+    `os.copy_file_range`. Other platforms, or filesystems which support neither,
+    fall back to `shutil.copy2`.
+
+    Note that hard links cannot be used instead as `tclfmt --in-place` truncates
+    and rewrites files, which would modify the original source.
+
+    Args:
+        src: The file to copy.
+        dst: The destination of the copy.
+    """
+    if sys.platform != "linux":
+        shutil.copy2(src, dst)
+        return
+
+    import fcntl  # pylint: disable=import-outside-toplevel
+
+    with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+        stat = os.fstat(src_file.fileno())
+        remaining = stat.st_size
+        try:
+            fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+            remaining = 0
+        except OSError:
+            pass
+
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(
+                    src_file.fileno(), dst_file.fileno(), remaining
+                )
+                if not copied:
+                    break
+                remaining -= copied
+        except OSError:
+            pass
+
+    if remaining > 0:
+        shutil.copy2(src, dst)
+        return
+
+    os.utime(dst, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+
 def copy_to_temp_preserving_paths(srcs: list[Path], temp_dir: Path) -> dict[Path, Path]:
     """Copy source files to temp directory preserving relative paths.
 
@@ -157,11 +302,11 @@ def copy_to_temp_preserving_paths(srcs: list[Path], temp_dir: Path) -> dict[Path
         src_abs = srcs[0]
         temp_file = temp_dir / src_abs.name
         temp_file.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(src_abs, temp_file)
+        copy_file(src_abs, temp_file)
         path_map[src_abs] = temp_file
     else:
         # Multiple files - find common path prefix
-        common_prefix = Path(os.path.commonpath([str(p) for p in srcs]))
+        common_prefix = Path(*common_parts(srcs))
 
         for src_abs in srcs:
             try:
@@ -180,91 +325,327 @@ def copy_to_temp_preserving_paths(srcs: list[Path], temp_dir: Path) -> dict[Path
             temp_file.parent.mkdir(parents=True, exist_ok=True)
 
             # Copy file
-            shutil.copy2(src_abs, temp_file)
+            copy_file(src_abs, temp_file)
             path_map[src_abs] = temp_file
 
     return path_map
 
 
-def generate_diff(original_path: Path, formatted_path: Path) -> str:
+def split_lines(text: str) -> list[str]:
+    """Split text into lines, keeping line endings.
+
+    Unlike `str.splitlines`, only `\n`, `\r` and `\r\n` end a line. Other
+    separators such as form feeds are content within a line.
+
+    Args:
+        text: The text to split.
+
+    Returns:
+        The lines of the text.
+    """
+    return io.StringIO(text, newline="").readlines()
+
+
+def generate_diff(
+    original_path: Path, original_lines: list[str], formatted_lines: list[str]
+) -> Iterator[str]:
     """Generate a unified diff between original and formatted file.
 
     Args:
         original_path: Path to the original file
-        formatted_path: Path to the formatted file
+        original_lines: The lines of the original file, including line endings.
+        formatted_lines: The lines of the formatted file, including line endings.
 
     Returns:
-        Diff string
+        An iterator of newline terminated diff lines.
     """
-    original_lines = original_path.read_text(encoding="utf-8").splitlines()
-    formatted_lines = formatted_path.read_text(encoding="utf-8").splitlines()
-
-    diff = difflib.unified_diff(
+    # `RULES_TCL_FORMAT_DIFFLIB` restores `difflib` diffs, e.g. for comparing output.
+    unified_diff = (
+        difflib.unified_diff
+        if os.environ.get("RULES_TCL_FORMAT_DIFFLIB")
+        else patience_unified_diff
+    )
+    for line in unified_diff(
         original_lines,
         formatted_lines,
         fromfile=str(original_path),
         tofile=f"{original_path} - formatted",
-        lineterm="",
-    )
+        # Header lines need their own terminator since content lines keep theirs.
+        # This is explicit as the default differs between diff implementations.
+        lineterm="\n",
+    ):
+        if not line.endswith(("\n", "\r")):
+            line += "\n\\ No newline at end of file\n"
+        yield line
+
 
-    return "\n".join(diff)
+def generate_diff_pair(result: FormatResult) -> str:
+    """Generate a unified diff for an `(original_path, original, formatted)` result.
 
+    This is a picklable wrapper around `generate_diff` for use in a process pool.
 
-def main() -> int:
-    """The main entrypoint.
+    Args:
+        result: The original path and the original and formatted lines.
 
     Returns:
-        Exit code (0 for success, non-zero for failure)
+        The complete diff as a string.
+    """
+    return "".join(generate_diff(*result))
+
+
+def write_diffs(results: list[FormatResult], output: TextIO) -> None:
+    """Write the diffs of formatting results in order.
+
+    When more processes are requested with `RULES_TCL_LINT_JOBS`, diffs of many
+    results are generated in a process pool, with each worker receiving a single even
+    share of the results.
+
+    Args:
+        results: The formatting results to diff.
+        output: The stream to write diffs to.
+    """
+    workers = parallel_jobs(len(results), PARALLEL_DIFF_THRESHOLD)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for diff in executor.map(
+                generate_diff_pair,
+                results,
+                chunksize=-(-len(results) // workers),
+            ):
+                output.write(diff)
+    else:
+        for result in results:
+            output.writelines(generate_diff(*result))
+
+
+def read_source(src: Path, report: list[str]) -> str:
+    """Read a source the way `tclfmt` does, replacing undecodable bytes.
+
+    Args:
+        src: The source to read.
+        report: The report to add any decoding warnings to.
+
+    Returns:
+        The contents of the source.
     """
-    args = parse_args()
+    register_codec_warning("replace_with_warning")
+    with redirect_stdout(io.StringIO()) as warnings:
+        text = src.read_text(encoding="utf-8", errors="replace_with_warning")
+    report.extend(warnings.getvalue().splitlines())
+    return text
+
+
+def make_formatter(config: "Config") -> tuple["Parser", "Formatter"]:
+    """Create the parser and formatter `tclfmt` would use for a config.
+
+    Args:
+        config: The tclint config for a source.
 
-    # First, run format check
-    check_code, check_output = run_format(
-        args.config,
-        args.srcs,
-        ["--check"],
+    Returns:
+        The parser and formatter.
+    """
+    plugins = [config.commands] if config.commands is not None else []
+    formatter = Formatter(
+        FormatterOpts(
+            indent=config.get_indent(),
+            spaces_in_braces=config.style_spaces_in_braces,
+            max_blank_lines=config.style_max_blank_lines,
+            indent_namespace_eval=config.style_indent_namespace_eval,
+        )
     )
+    return Parser(command_plugins=plugins), formatter
 
-    # If check passes, we're done
-    if check_code == 0:
-        # Touch marker file on success
-        if args.marker:
-            args.marker.parent.mkdir(exist_ok=True, parents=True)
-            args.marker.write_bytes(b"")
-        sys.exit(0)
 
-    print(check_output, file=sys.stderr)
+def format_sources(
+    config_path: Path, srcs: list[Path]
+) -> tuple[int, str, list[FormatResult]]:
+    """Check the formatting of sources in memory using tclint's formatter API.
 
-    # Check failed, so we need to format and show diff
-    # Create temporary directory
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
+    The config is loaded once and each source is read and parsed once, with the
+    formatted result diffed directly against the original text.
 
-        # Copy source files to temp directory preserving paths
-        path_map = copy_to_temp_preserving_paths(args.srcs, temp_path)
+    Args:
+        config_path: Path to the config file
+        srcs: List of source file paths
+
+    Returns:
+        A tclfmt style exit code and report, and the original path and the original
+        and formatted lines of each source which needs formatting.
+    """
+    try:
+        config = get_config(config_path, Path.cwd())
+    except ConfigError as e:
+        return EXIT_INPUT_ERROR, f"Invalid config file: {e}", []
+
+    if config is None:
+        config = RunConfig()
+
+    try:
+        sources = resolve_sources(
+            srcs,
+            exclude_patterns=config.exclude,
+            exclude_root=Path.cwd(),
+            extensions=config.extensions,
+        )
+    except FileNotFoundError as e:
+        return EXIT_INPUT_ERROR, f"Invalid path provided: {e}", []
+
+    # Sources sharing a config share a parser and formatter.
+    formatters: dict[int, tuple["Parser", "Formatter"]] = {}
+    exit_code = 0
+    report: list[str] = []
+    results = []
+    for src in sources:
+        src_config = config.get_for_path(src)
+        if id(src_config) not in formatters:
+            formatters[id(src_config)] = make_formatter(src_config)
+        parser, formatter = formatters[id(src_config)]
+
+        original = read_source(src, report)
+
+        try:
+            formatted = formatter.format_top(original, parser)
+        except TclSyntaxError as e:
+            report.append(f"{src}:{e.start[0]}:{e.start[1]}: syntax error: {e}")
+            exit_code |= EXIT_SYNTAX_ERROR
+            continue
+
+        if original != formatted:
+            report.append(f"{src}: needs reformatting")
+            exit_code |= EXIT_FORMAT_VIOLATIONS
+            results.append(
+                (
+                    src,
+                    split_lines(original),
+                    split_lines(formatted),
+                )
+            )
+
+    if results:
+        report.append(
+            f"{len(results)} {'file needs' if len(results) == 1 else 'files need'}"
+            f" reformatting. Checked {len(sources)}"
+            f" {'file' if len(sources) == 1 else 'files'}."
+        )
+
+    return exit_code, "\n".join(report), results
+
+
+def format_in_temp_dir(
+    config: Path, srcs: list[Path]
+) -> tuple[int, str, list[FormatResult]]:
+    """Format copies of sources in place within a temporary directory.
+
+    Args:
+        config: Path to the config file
+        srcs: List of source file paths
 
-        # Get list of temp file paths
-        temp_srcs = sorted(path_map.values())
+    Returns:
+        The tclfmt exit code and output, and upon success, the original path and
+        the original and formatted lines of each source.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Copy source files to temp directory preserving paths
+        path_map = copy_to_temp_preserving_paths(srcs, Path(temp_dir))
 
         # Run format tool on copied files (without --check)
         fmt_code, fmt_output = run_format(
-            args.config,
-            temp_srcs,
+            config,
+            sorted(path_map.values()),
             ["--in-place"],
         )
 
         if fmt_code != 0:
-            print(fmt_output, file=sys.stderr)
-            sys.exit(fmt_code)
+            return fmt_code, fmt_output, []
+
+        return (
+            0,
+            fmt_output,
+            [
+                (
+                    original_path,
+                    split_lines(
+                        original_path.read_text(encoding="utf-8", errors="replace")
+                    ),
+                    split_lines(
+                        temp_path.read_text(encoding="utf-8", errors="replace")
+                    ),
+                )
+                for original_path, temp_path in path_map.items()
+            ],
+        )
+
+
+def run(args: argparse.Namespace, output: TextIO) -> int:
+    """Check the formatting of the sources described by the parsed arguments.
+
+    Args:
+        args: The parsed command line arguments.
+        output: The stream to write diagnostics and diffs to.
+
+    Returns:
+        Exit code (0 for success, non-zero for failure)
+    """
+    # Nothing has changed since the last successful run
+    digest = inputs_digest(Path(__file__), args.config, args.srcs)
+    if marker_is_current(args.marker, digest):
+        return 0
+
+    # Skip the format check entirely if these exact inputs have already passed
+    results: list[FormatResult] = []
+    cached = cache_entry(digest)
+    if cached and cached.exists():
+        check_code, check_output = 0, ""
+    elif HAS_FORMAT_API:
+        check_code, check_output, results = format_sources(args.config, args.srcs)
+    else:
+        # Without the formatter API, drive the `tclfmt` CLI instead. Output is
+        # only needed on failure so it's discarded on the first run.
+        check_code, check_output = run_format(
+            args.config,
+            args.srcs,
+            ["--check"],
+            capture=False,
+        )
+        if check_code != 0:
+            check_code, check_output = run_format(
+                args.config,
+                args.srcs,
+                ["--check"],
+            )
+
+    # If check passes, we're done
+    if check_code == 0:
+        record_cache_entry(cached)
+
+        # Write the marker file on success
+        write_marker(args.marker, digest)
+        return 0
+
+    print(check_output, file=output)
+
+    # Check failed, so we need to format and show diff. Without the formatter
+    # API, this is done by formatting copies of the sources on disk.
+    if not HAS_FORMAT_API:
+        fmt_code, fmt_output, results = format_in_temp_dir(args.config, args.srcs)
+        if fmt_code != 0:
+            print(fmt_output, file=output)
+            return fmt_code
 
-        # Generate and print diffs for each file
-        for original_path, temp_path_mapped in path_map.items():
-            diff = generate_diff(original_path, temp_path_mapped)
-            if diff:
-                print(diff, file=sys.stderr)
+    # Generate and print diffs for each file
+    write_diffs(results, output)
 
     # Return error code since formatting was needed
-    sys.exit(1)
+    return check_code
+
+
+def main() -> None:
+    """The main entrypoint."""
+    if "--persistent_worker" in sys.argv[1:]:
+        run_persistent_worker(parse_args, run)
+        return
+
+    sys.exit(run(parse_args(), sys.stderr))
 
 
 if __name__ == "__main__":
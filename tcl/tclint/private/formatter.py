@@ -78,13 +78,15 @@ def parse_args() -> argparse.Namespace:
 def query_targets(scope: Sequence[str], bazel: Path, workspace_dir: Path) -> List[str]:
     """Query for all source targets of all tcl targets within a given workspace.
 
+    Query results are streamed and converted to paths as they are read.
+
     Args:
         scope: The scope of the Bazel query (e.g. `//...`)
         bazel: The path to a Bazel binary.
         workspace_dir: The workspace root in which to query.
 
     Returns:
-        A list of all discovered targets.
+        The workspace relative paths of all discovered source targets.
     """
     # Query explanation:
     # Filter targets down to anything beginning with `//` and ends with `.tcl`.
@@ -95,7 +97,7 @@ def query_targets(scope: Sequence[str], bazel: Path, workspace_dir: Path) -> Lis
     # pylint: disable-next=line-too-long
     query_template = r"""filter("^//.*\.tcl$", kind("source file", deps(set({scope}) except attr(tags, "(^\[|, )(noformat|no-format|no-tcl-format)(, |\]$)", set({scope})), 1)))"""
 
-    query_result = subprocess.run(
+    with subprocess.Popen(
         [
             str(bazel),
             "query",
@@ -106,11 +108,12 @@ def query_targets(scope: Sequence[str], bazel: Path, workspace_dir: Path) -> Lis
         cwd=str(workspace_dir),
         stdout=subprocess.PIPE,
         encoding="utf-8",
-        check=False,
-    )
+        bufsize=1,
+    ) as proc:
+        assert proc.stdout is not None
+        sources = [pathify(line.rstrip()) for line in proc.stdout if line.strip()]
 
-    targets = query_result.stdout.splitlines()
-    return targets
+    return sources
 
 
 def run_tclfmt(
@@ -163,13 +166,17 @@ def run_tclfmt(
         sys.exit(exit_code)
 
 
+# Translation table for converting the package separator of a label to a path separator.
+_PATHIFY_TABLE = str.maketrans({":": "/"})
+
+
 def pathify(label: str) -> str:
     """Converts `//foo:bar` into `foo/bar`."""
     if label.startswith("@"):
         raise ValueError("External labels are unsupported", label)
     if label.startswith("//:"):
         return label[3:]
-    return label.replace(":", "/").replace("//", "")
+    return label[2:].translate(_PATHIFY_TABLE)
 
 
 def main() -> None:
@@ -192,14 +199,12 @@ def main() -> None:
     settings = _rlocation(runfiles, os.environ["TCLFMT_SETTINGS_PATH"])
 
     # Query for all sources
-    targets = query_targets(
+    sources = query_targets(
         scope=args.scope,
         bazel=args.bazel,
         workspace_dir=workspace_dir,
     )
 
-    sources = [pathify(t) for t in targets]
-
     run_tclfmt(
         sources=sources,
         settings_path=settings,
@@ -5,12 +5,28 @@ import io
 import os
 import platform
 import sys
-from contextlib import redirect_stderr, redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, redirect_stderr, redirect_stdout
 from pathlib import Path
+from typing import Optional, TextIO
 
 from python.runfiles import Runfiles
 from tclint.cli.tclint import main as tclint_main
 
+from tcl.tclint.private.runner import (
+    cache_entry,
+    discard_output,
+    inputs_digest,
+    marker_is_current,
+    parallel_jobs,
+    record_cache_entry,
+    run_persistent_worker,
+    write_marker,
+)
+
+# The number of sources below which linting always runs in a single process.
+PARALLEL_LINT_THRESHOLD = 16
+
 
 def _rlocation(runfiles: Runfiles, rlocationpath: str) -> Path:
     """Look up a runfile and ensure the file exists
@@ -35,11 +51,16 @@ def _rlocation(runfiles: Runfiles, rlocationpath: str) -> Path:
     return path
 
 
-def parse_args() -> argparse.Namespace:
-    """Parse command line arguments."""
-    parser = argparse.ArgumentParser(description=__doc__)
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments.
+
+    Args:
+        argv: Arguments to parse instead of `sys.argv`.
 
-    argv = None
+    Returns:
+        The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, fromfile_prefix_chars="@")
 
     def _lookup(value: str) -> Path:
         del value
@@ -64,11 +85,15 @@ def parse_args() -> argparse.Namespace:
         "--src",
         dest="srcs",
         type=_lookup if use_args_file else Path,
-        required=True,
         action="append",
         default=[],
         help="Sources to lint/format.",
     )
+    parser.add_argument(
+        "--srcs-file",
+        type=_lookup if use_args_file else Path,
+        help="A file containing newline separated sources to lint/format.",
+    )
     parser.add_argument(
         "--config",
         type=_lookup if use_args_file else Path,
@@ -78,21 +103,36 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--marker",
         type=Path,
-        help="An optional output to touch upon successful lint/formatting.",
+        help="An optional output to write upon successful lint/formatting.",
     )
 
-    return parser.parse_args(argv)
+    args = parser.parse_args(argv)
+
+    if args.srcs_file:
+        lookup = _lookup if use_args_file else Path
+        args.srcs.extend(
+            lookup(line)
+            for line in args.srcs_file.read_text(encoding="utf-8").splitlines()
+            if line
+        )
+
+    if not args.srcs:
+        parser.error("at least one source is required from --src or --srcs-file")
+
+    return args
 
 
 def run_lint(
     config: str,
     srcs: list[str],
+    capture: bool = True,
 ) -> tuple[int, str]:
     """Run a tclint tool (tclint or tclfmt) and capture its output.
 
     Args:
         config: Path to the config file
         srcs: List of source file paths
+        capture: Whether to capture output. Otherwise output is discarded.
 
     Returns:
         Tuple of (return_code, captured_output)
@@ -106,8 +146,14 @@ def run_lint(
         # Set up sys.argv for tool_main
         sys.argv = tool_args
 
-        # Capture both stdout and stderr to the shared buffer
-        with redirect_stdout(output_buffer), redirect_stderr(output_buffer):
+        # Capture both stdout and stderr to the shared buffer (or discard them)
+        with ExitStack() as stack:
+            if capture:
+                stack.enter_context(redirect_stdout(output_buffer))
+                stack.enter_context(redirect_stderr(output_buffer))
+            else:
+                stack.enter_context(discard_output())
+
             # Run tool main function
             # It may return a code, return None, or raise SystemExit
             return_code = 0
@@ -134,25 +180,85 @@ def run_lint(
         sys.argv = original_argv
 
 
+def run_lint_parallel(config: str, srcs: list[str], jobs: int) -> tuple[int, str]:
+    """Run tclint across a pool of processes, each linting one chunk of sources.
+
+    Output is always captured as it has to be passed back from the pool anyway.
+
+    Args:
+        config: Path to the config file
+        srcs: List of source file paths
+        jobs: The number of processes, and so chunks, to use.
+
+    Returns:
+        Tuple of (return_code, captured_output)
+    """
+    size = -(-len(srcs) // jobs)
+    chunks = [srcs[i : i + size] for i in range(0, len(srcs), size)]
+
+    return_code = 0
+    outputs = []
+    with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+        for code, output in executor.map(run_lint, [config] * len(chunks), chunks):
+            # tclint exit codes are bit flags.
+            return_code |= code
+            outputs.append(output)
+    return return_code, "".join(outputs)
+
+
+def run(args: argparse.Namespace, output: TextIO) -> int:
+    """Lint the sources described by the parsed arguments.
+
+    Args:
+        args: The parsed command line arguments.
+        output: The stream to write diagnostics to.
+
+    Returns:
+        Exit code (0 for success, non-zero for failure)
+    """
+    # Nothing has changed since the last successful run
+    digest = inputs_digest(Path(__file__), args.config, args.srcs)
+    if marker_is_current(args.marker, digest):
+        return 0
+
+    # Skip linting entirely if these exact inputs have already passed
+    cached = cache_entry(digest)
+    if not cached or not cached.exists():
+        jobs = parallel_jobs(len(args.srcs), PARALLEL_LINT_THRESHOLD)
+        if jobs > 1:
+            lint_code, lint_output = run_lint_parallel(args.config, args.srcs, jobs)
+        else:
+            # Output is only needed on failure so it's discarded on the first run.
+            lint_code, lint_output = run_lint(
+                args.config,
+                args.srcs,
+                capture=False,
+            )
+            if lint_code:
+                lint_code, lint_output = run_lint(
+                    args.config,
+                    args.srcs,
+                )
+
+        if lint_code:
+            print(lint_output, file=output)
+            return lint_code
+
+        record_cache_entry(cached)
+
+    # Write the marker file on success
+    write_marker(args.marker, digest)
+
+    return 0
+
+
 def main() -> None:
     """The main entrypoint."""
-    args = parse_args()
+    if "--persistent_worker" in sys.argv[1:]:
+        run_persistent_worker(parse_args, run)
+        return
 
-    lint_code = 0
-
-    # Run linting if requested (always run, even if formatting will also run)
-    lint_code, lint_output = run_lint(
-        args.config,
-        args.srcs,
-    )
-    if lint_code:
-        print(lint_output, file=sys.stderr)
-        sys.exit(lint_code)
-
-    # Touch marker file on success (only if both steps passed)
-    if args.marker:
-        args.marker.parent.mkdir(exist_ok=True, parents=True)
-        args.marker.write_bytes(b"")
+    sys.exit(run(parse_args(), sys.stderr))
 
 
 if __name__ == "__main__":
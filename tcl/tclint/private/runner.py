@@ -0,0 +1,219 @@
+"""Utilities shared by the TclLint and TclFormat action runners."""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import traceback
+from contextlib import contextmanager, redirect_stderr
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Callable, Iterator, Optional, TextIO
+
+from tclint.config import ConfigError, get_config
+
+
+def inputs_digest(script: Path, config: Path, srcs: list[Path]) -> Optional[str]:
+    """Compute a digest of everything which determines the result of a check.
+
+    This covers the tclint version, the contents of the runner script (and this
+    module), the config and any command plugin specs it references, and the path and
+    content of every source. Everything but the sources is hashed by content alone so
+    the digest does not depend on where the runfiles (e.g. the action sandbox) are
+    located.
+
+    Args:
+        script: The runner script performing the check.
+        config: Path to the config file
+        srcs: List of source file paths
+
+    Returns:
+        The hex digest or `None` if any input could not be read.
+    """
+    try:
+        try:
+            tclint_version = version("tclint")
+        except PackageNotFoundError:
+            tclint_version = "unknown"
+
+        run_config = get_config(config, Path.cwd())
+        commands: set[Path] = set()
+        if run_config:
+            commands = {run_config.get_for_path(src).commands for src in srcs}
+            commands.discard(None)
+
+        digest = hashlib.blake2b()
+
+        def _update(data: bytes) -> None:
+            # Length prefix each field so adjacent fields cannot run together.
+            digest.update(len(data).to_bytes(8, "little"))
+            digest.update(data)
+
+        _update(tclint_version.encode("utf-8"))
+        for path in [script, Path(__file__), config, *sorted(commands)]:
+            _update(path.read_bytes())
+        for src in srcs:
+            _update(str(src).encode("utf-8"))
+            _update(src.read_bytes())
+    except (ConfigError, OSError, RuntimeError):
+        return None
+
+    return digest.hexdigest()
+
+
+def cache_entry(digest: Optional[str]) -> Optional[Path]:
+    """Locate the cache entry recording a successful check.
+
+    Caching is opt-in and only enabled when `RULES_TCL_CACHE_DIR` is set.
+
+    Args:
+        digest: The `inputs_digest` of the check.
+
+    Returns:
+        The path of the cache entry or `None` if no cache is available.
+    """
+    if "RULES_TCL_CACHE_DIR" not in os.environ or not digest:
+        return None
+
+    return Path(os.environ["RULES_TCL_CACHE_DIR"]) / digest
+
+
+def record_cache_entry(entry: Optional[Path]) -> None:
+    """Record a successful run in the cache, ignoring unwritable caches.
+
+    Args:
+        entry: The cache entry from `cache_entry`.
+    """
+    if not entry:
+        return
+    try:
+        entry.parent.mkdir(exist_ok=True, parents=True)
+        entry.touch(exist_ok=True)
+    except OSError:
+        pass
+
+
+def marker_is_current(marker: Optional[Path], digest: Optional[str]) -> bool:
+    """Check whether the marker was written by a successful check of the same inputs.
+
+    Args:
+        marker: The marker written by `write_marker`.
+        digest: The `inputs_digest` of the check.
+
+    Returns:
+        True if a previous successful run already covers the current inputs.
+    """
+    if not marker or not digest:
+        return False
+
+    try:
+        return marker.read_text(encoding="utf-8") == digest
+    except OSError:
+        return False
+
+
+def write_marker(marker: Optional[Path], digest: Optional[str]) -> None:
+    """Write the marker of a successful check, recording the digest of its inputs.
+
+    Args:
+        marker: The marker to write.
+        digest: The `inputs_digest` of the check.
+    """
+    if not marker:
+        return
+
+    marker.parent.mkdir(exist_ok=True, parents=True)
+    marker.write_text(digest or "", encoding="utf-8")
+
+
+def parallel_jobs(count: int, threshold: int) -> int:
+    """Determine the number of processes to spread a runner's work items across.
+
+    Bazel already runs actions in parallel, so runners use a single process unless
+    more are requested with `RULES_TCL_LINT_JOBS`. Fewer than `threshold` items are
+    always handled in a single process as the pool would cost more than it saves.
+
+    Args:
+        count: The number of work items.
+        threshold: The number of work items below which a single process is used.
+
+    Returns:
+        The number of processes to use.
+    """
+    if count < threshold:
+        return 1
+
+    try:
+        jobs = int(os.environ.get("RULES_TCL_LINT_JOBS", "1"))
+    except ValueError:
+        return 1
+
+    return max(1, min(jobs, count, os.cpu_count() or 1))
+
+
+@contextmanager
+def discard_output() -> Iterator[None]:
+    """Point the stdout and stderr file descriptors at the null device.
+
+    Unlike capturing output in a buffer, this costs nothing per write.
+    """
+    sys.stdout.flush()
+    sys.stderr.flush()
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    saved_fds = [os.dup(1), os.dup(2)]
+    try:
+        os.dup2(devnull, 1)
+        os.dup2(devnull, 2)
+        yield
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(saved_fds[0], 1)
+        os.dup2(saved_fds[1], 2)
+        for fd in [devnull, *saved_fds]:
+            os.close(fd)
+
+
+def run_persistent_worker(
+    parse_args: Callable[[list[str]], argparse.Namespace],
+    run: Callable[[argparse.Namespace, TextIO], int],
+) -> None:
+    """Serve Bazel persistent worker requests over the JSON worker protocol.
+
+    See https://bazel.build/remote/persistent
+
+    Args:
+        parse_args: The runner's argument parser.
+        run: The runner's implementation, taking parsed arguments and an output stream.
+    """
+    # Stdout is reserved for responses so send anything else to stderr.
+    responses = sys.stdout
+    sys.stdout = sys.stderr
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+
+        request = json.loads(line)
+        output = io.StringIO()
+        try:
+            with redirect_stderr(output):
+                args = parse_args(request.get("arguments", []))
+            exit_code = run(args, output)
+        except SystemExit as e:
+            exit_code = (
+                int(e.code) if isinstance(e.code, int) else (0 if e.code is None else 1)
+            )
+        except Exception:  # pylint: disable=broad-exception-caught
+            traceback.print_exc(file=output)
+            exit_code = 1
+
+        response = {
+            "exitCode": exit_code,
+            "output": output.getvalue(),
+            "requestId": request.get("requestId", 0),
+        }
+        responses.write(json.dumps(response) + "\n")
+        responses.flush()
@@ -8,21 +8,36 @@ def _rlocationpath(file, workspace_name):
 
     return "{}/{}".format(workspace_name, file.short_path)
 
+_LINT_IGNORE_TAGS = [
+    "no_tcl_lint",
+    "no_tclint",
+    "no_lint",
+    "nolint",
+]
+
+_FMT_IGNORE_TAGS = [
+    "no_tcl_format",
+    "no_tclformat",
+    "no_tclfmt",
+    "noformat",
+    "nofmt",
+]
+
+def _has_ignore_tag(tags, ignore_tags):
+    for tag in tags:
+        sanitized = tag.replace("-", "_").lower()
+        if sanitized in ignore_tags:
+            return True
+
+    return False
+
 def _tcl_tclint_aspect_impl(target, ctx):
     srcs = find_srcs(target)
     if not srcs:
         return []
 
-    ignore_tags = [
-        "no_tcl_lint",
-        "no_tclint",
-        "no_lint",
-        "nolint",
-    ]
-    for tag in ctx.rule.attr.tags:
-        sanitized = tag.replace("-", "_").lower()
-        if sanitized in ignore_tags:
-            return []
+    if _has_ignore_tag(ctx.rule.attr.tags, _LINT_IGNORE_TAGS):
+        return []
 
     lint_srcs = [src for src in srcs if src.basename != "pkgIndex.tcl"]
     if not lint_srcs:
@@ -32,6 +47,8 @@ def _tcl_tclint_aspect_impl(target, ctx):
     output = ctx.actions.declare_file("{}.tclint.ok".format(target.label.name))
 
     args = ctx.actions.args()
+    args.set_param_file_format("multiline")
+    args.use_param_file("@%s", use_always = True)
     args.add_all(lint_srcs, format_each = "--src=%s")
     args.add("--config", config)
     args.add("--marker", output)
@@ -43,6 +60,10 @@ def _tcl_tclint_aspect_impl(target, ctx):
         inputs = depset(lint_srcs + [config]),
         progress_message = "TclLint %{label}",
         outputs = [output],
+        execution_requirements = {
+            "requires-worker-protocol": "json",
+            "supports-workers": "1",
+        },
     )
 
     return [OutputGroupInfo(
@@ -70,6 +91,13 @@ To skip tclint for specific targets, add one of these tags:
 - `no_tclint`
 - `no_lint`
 - `nolint`
+
+**Caching:**
+
+Successful runs can be recorded in a local cache so that identical inputs are not
+checked again by enabling it with `--action_env=RULES_TCL_CACHE_DIR=<path>`. Entries
+are keyed by the tclint version, the runner, the config and any command plugin
+specs it references, and the sources. Unwritable cache directories are ignored.
 """,
     implementation = _tcl_tclint_aspect_impl,
     attrs = {
@@ -173,22 +201,15 @@ def _tcl_tclint_fmt_aspect_impl(target, ctx):
     if not srcs:
         return []
 
-    ignore_tags = [
-        "no_tcl_format",
-        "no_tclformat",
-        "no_tclfmt",
-        "noformat",
-        "nofmt",
-    ]
-    for tag in ctx.rule.attr.tags:
-        sanitized = tag.replace("-", "_").lower()
-        if sanitized in ignore_tags:
-            return []
+    if _has_ignore_tag(ctx.rule.attr.tags, _FMT_IGNORE_TAGS):
+        return []
 
     config = ctx.file._config
     output = ctx.actions.declare_file("{}.tclfmt.ok".format(target.label.name))
 
     args = ctx.actions.args()
+    args.set_param_file_format("multiline")
+    args.use_param_file("@%s", use_always = True)
     args.add_all(srcs, format_each = "--src=%s")
     args.add("--config", config)
     args.add("--marker", output)
@@ -200,6 +221,10 @@ def _tcl_tclint_fmt_aspect_impl(target, ctx):
         inputs = depset(srcs + [config]),
         progress_message = "TclFormat %{label}",
         outputs = [output],
+        execution_requirements = {
+            "requires-worker-protocol": "json",
+            "supports-workers": "1",
+        },
     )
 
     return [OutputGroupInfo(
@@ -228,6 +253,19 @@ To skip format checking for specific targets, add one of these tags:
 - `no_tclfmt`
 - `noformat`
 - `nofmt`
+
+**Caching:**
+
+Successful runs can be recorded in a local cache so that identical inputs are not
+checked again by enabling it with `--action_env=RULES_TCL_CACHE_DIR=<path>`. Entries
+are keyed by the tclint version, the runner, the config and any command plugin
+specs it references, and the sources. Unwritable cache directories are ignored.
+
+**Parallelism:**
+
+Like other actions, the format check uses a single core by default. Diffs for actions
+with many unformatted sources can instead be generated across multiple processes with
+`--action_env=RULES_TCL_LINT_JOBS=<n>`.
 """,
     implementation = _tcl_tclint_fmt_aspect_impl,
     attrs = {
@@ -325,3 +363,181 @@ tcl_tclint_fmt_test(
         ),
     },
 )
+
+_TclintSrcsInfo = provider(
+    doc = "Sources to lint and format check collected from a target and its dependencies.",
+    fields = {
+        "fmt_srcs": "Depset[File]: Sources to check the formatting of.",
+        "lint_srcs": "Depset[File]: Sources to lint.",
+    },
+)
+
+def _tclint_srcs_aspect_impl(target, ctx):
+    srcs = find_srcs(target)
+
+    lint_srcs = []
+    if not _has_ignore_tag(ctx.rule.attr.tags, _LINT_IGNORE_TAGS):
+        lint_srcs = [src for src in srcs if src.basename != "pkgIndex.tcl"]
+
+    fmt_srcs = []
+    if not _has_ignore_tag(ctx.rule.attr.tags, _FMT_IGNORE_TAGS):
+        fmt_srcs = srcs
+
+    deps = [
+        dep[_TclintSrcsInfo]
+        for dep in getattr(ctx.rule.attr, "deps", [])
+        if _TclintSrcsInfo in dep
+    ]
+
+    return [_TclintSrcsInfo(
+        fmt_srcs = depset(fmt_srcs, transitive = [dep.fmt_srcs for dep in deps]),
+        lint_srcs = depset(lint_srcs, transitive = [dep.lint_srcs for dep in deps]),
+    )]
+
+_tclint_srcs_aspect = aspect(
+    doc = "An aspect for collecting the sources of Tcl targets and their dependencies.",
+    implementation = _tclint_srcs_aspect_impl,
+    attr_aspects = ["deps"],
+)
+
+def _tclint_aggregate_action(ctx, mnemonic, suffix, executable, srcs, config):
+    """Declare a single action checking all `srcs` at once.
+
+    Args:
+        ctx (ctx): The rule's context object.
+        mnemonic (str): The action mnemonic.
+        suffix (str): The suffix of files declared for the action.
+        executable (File): The `linter` or `format_checker` executable.
+        srcs (depset[File]): The sources to check.
+        config (File): The tclint config file.
+
+    Returns:
+        File: The marker written upon success.
+    """
+    output = ctx.actions.declare_file("{}.{}.ok".format(ctx.label.name, suffix))
+
+    if not srcs:
+        ctx.actions.write(
+            output = output,
+            content = "",
+        )
+        return output
+
+    srcs_args = ctx.actions.args()
+    srcs_args.set_param_file_format("multiline")
+    srcs_args.add_all(srcs)
+
+    srcs_file = ctx.actions.declare_file("{}.{}.srcs.txt".format(ctx.label.name, suffix))
+    ctx.actions.write(
+        output = srcs_file,
+        content = srcs_args,
+    )
+
+    args = ctx.actions.args()
+    args.set_param_file_format("multiline")
+    args.use_param_file("@%s", use_always = True)
+    args.add("--srcs-file", srcs_file)
+    args.add("--config", config)
+    args.add("--marker", output)
+
+    ctx.actions.run(
+        mnemonic = mnemonic,
+        executable = executable,
+        arguments = [args],
+        inputs = depset([srcs_file, config], transitive = [srcs]),
+        progress_message = "{} %{{label}}".format(mnemonic),
+        outputs = [output],
+        execution_requirements = {
+            "requires-worker-protocol": "json",
+            "supports-workers": "1",
+        },
+    )
+
+    return output
+
+def _tcl_tclint_aggregate_impl(ctx):
+    infos = [target[_TclintSrcsInfo] for target in ctx.attr.targets]
+    config = ctx.file._config
+
+    lint_marker = _tclint_aggregate_action(
+        ctx = ctx,
+        mnemonic = "TclLint",
+        suffix = "tclint",
+        executable = ctx.executable._linter,
+        srcs = depset(transitive = [info.lint_srcs for info in infos]),
+        config = config,
+    )
+    fmt_marker = _tclint_aggregate_action(
+        ctx = ctx,
+        mnemonic = "TclFormat",
+        suffix = "tclfmt",
+        executable = ctx.executable._formatter,
+        srcs = depset(transitive = [info.fmt_srcs for info in infos]),
+        config = config,
+    )
+
+    return [DefaultInfo(
+        files = depset([lint_marker, fmt_marker]),
+    )]
+
+tcl_tclint_aggregate = rule(
+    doc = """\
+A rule for performing tclint linting and formatting checks on many Tcl targets at once.
+
+All sources of `targets` and their transitive dependencies are checked in a single
+linting action and a single formatting action. This amortizes the cost of starting
+tclint and parsing the config across all targets, which is significant for builds
+with many small targets.
+
+**Usage:**
+
+```python
+load("@rules_tcl//tcl/tclint:tcl_tclint_aggregate.bzl", "tcl_tclint_aggregate")
+
+tcl_tclint_aggregate(
+    name = "tclint",
+    targets = [
+        "//my:binary",
+        "//my:library",
+    ],
+)
+```
+
+```bash
+bazel build //:tclint
+```
+
+The same tags used to skip `tcl_tclint_aspect` and `tcl_tclint_fmt_aspect`
+are respected for individual targets.
+
+**Parallelism:**
+
+Like other actions, the linting and format checks use a single core by default.
+Actions with many sources can instead be linted across multiple processes, each
+checking one chunk of the sources, with `--action_env=RULES_TCL_LINT_JOBS=<n>`. The
+same setting spreads the diffs of many unformatted sources across processes.
+""",
+    implementation = _tcl_tclint_aggregate_impl,
+    attrs = {
+        "targets": attr.label_list(
+            doc = "The Tcl targets whose sources (and those of their dependencies) should be checked.",
+            providers = [TclInfo],
+            aspects = [_tclint_srcs_aspect],
+            mandatory = True,
+        ),
+        "_config": attr.label(
+            allow_single_file = True,
+            default = Label("//tcl/tclint:config"),
+        ),
+        "_formatter": attr.label(
+            cfg = "exec",
+            executable = True,
+            default = Label("//tcl/tclint/private:format_checker"),
+        ),
+        "_linter": attr.label(
+            cfg = "exec",
+            executable = True,
+            default = Label("//tcl/tclint/private:linter"),
+        ),
+    },
+)
@@ -0,0 +1,8 @@
+"""tcl_tclint_aggregate"""
+
+load(
+    "//tcl/tclint/private:tclint.bzl",
+    _tcl_tclint_aggregate = "tcl_tclint_aggregate",
+)
+
+tcl_tclint_aggregate = _tcl_tclint_aggregate